@@ -6,22 +6,77 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont, QDoubleValidator, QIntValidator, QPalette, QColor
 from PyQt5.QtCore import Qt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
 
+# Custom colors for graphs
+PLOT_COLORS = ['#007ACC', '#00CC89', '#CC4400', '#CC008B']
+# Upper bound on points drawn per curve; longer schedules are downsampled for display
+MAX_PLOT_POINTS = 120
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    # Numba is optional; fall back to plain Python when it is not installed
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+    prange = range
+
+@njit('float64(float64, int64)', cache=True, fastmath=True)
+def _emi_factor(monthly_rate, total_months):
+    return (1 + monthly_rate) ** total_months
+
+@njit('float64(float64, float64, float64)', cache=True, fastmath=True)
 def calculate_emi(principal, annual_rate, tenure_years):
     monthly_rate = annual_rate / 100 / 12
     total_months = int(tenure_years * 12)
-    return principal * monthly_rate * (1 + monthly_rate) ** total_months / ((1 + monthly_rate) ** total_months - 1)
+    factor = _emi_factor(monthly_rate, total_months)
+    return principal * monthly_rate * factor / (factor - 1)
+
+def _amort_factors(monthly_rate, total_months):
+    # (1 + r)^k for k = 0..N from one np.power call; the last entry is the full-tenure factor
+    powers = np.power(1.0 + monthly_rate, np.arange(total_months + 1, dtype=np.float64))
+    return powers[-1], powers
+
+def _amort_curves_numpy(principal, monthly_rate, total_months, emi):
+    # Balance before month k+1 for k = 0..N, so a single sweep feeds both plots
+    factor, powers = _amort_factors(monthly_rate, total_months)
+    balance = principal * (factor - powers) / (factor - 1.0)
+    interest_component = balance[:-1] * monthly_rate
+    return balance[1:], emi - interest_component, interest_component
 
+# No explicit signature: compiled on the first plot rather than at import
+@njit(parallel=True, cache=True, fastmath=True)
+def _amort_curves_parallel(principal, monthly_rate, total_months, emi):
+    # Same curves as _amort_curves_numpy, with both month passes split across threads
+    factor = _emi_factor(monthly_rate, total_months)
+    balance = np.empty(total_months + 1)
+    for k in prange(total_months + 1):
+        balance[k] = principal * (factor - (1 + monthly_rate) ** k) / (factor - 1)
+    outstanding = np.empty(total_months)
+    principal_component = np.empty(total_months)
+    interest_component = np.empty(total_months)
+    for k in prange(total_months):
+        outstanding[k] = balance[k + 1]
+        interest_component[k] = balance[k] * monthly_rate
+        principal_component[k] = emi - interest_component[k]
+    return outstanding, principal_component, interest_component
+
+# Without Numba the prange kernel would be a per-month Python loop; NumPy is faster there
+_amort_curves = _amort_curves_parallel if HAVE_NUMBA else _amort_curves_numpy
+
+@njit('float64(float64, float64, float64, float64)', cache=True, fastmath=True)
 def calculate_outstanding_principal(principal, annual_rate, tenure_years, paid_months):
     monthly_rate = annual_rate / 100 / 12
     total_months = int(tenure_years * 12)
-    factor = (1 + monthly_rate) ** total_months
+    factor = _emi_factor(monthly_rate, total_months)
     paid_factor = (1 + monthly_rate) ** paid_months
     return principal * (factor - paid_factor) / (factor - 1)
 
+@njit('float64(float64, float64, float64, float64, float64)', cache=True, fastmath=True)
 def calculate_new_emi_after_lump(principal, annual_rate, tenure_years, lump_sum, nth_year):
     paid_months = int(nth_year * 12)
     outstanding = calculate_outstanding_principal(principal, annual_rate, tenure_years, paid_months)
@@ -36,6 +91,12 @@ class EMICalculator(QWidget):
         super().__init__()
         self.setWindowTitle("EMI Calculator")
         self.setMinimumSize(900, 700)  # Slightly larger for better spacing
+        self._pending_plot = None
+        self._plot_dirty = False
+        self.figure = None
+        self._ax1 = None
+        self._pie = None
+        self._stack_collections = []
         self.setup_dark_theme()
         self.init_ui()
 
@@ -127,7 +188,7 @@ class EMICalculator(QWidget):
         # Create main layout with tabs
         main_layout = QVBoxLayout()
         main_layout.setSpacing(10)
-        tab_widget = QTabWidget()
+        self.tab_widget = QTabWidget()
 
         # Input Tab
         input_widget = QWidget()
@@ -232,103 +293,172 @@ class EMICalculator(QWidget):
         input_layout.addWidget(results_frame)
         input_widget.setLayout(input_layout)
 
-        # Graphs Tab with dark theme
+        # Graphs Tab; the matplotlib canvas is created the first time it is shown
         graphs_widget = QWidget()
-        graphs_layout = QVBoxLayout()
-        
-        # Configure matplotlib dark theme
-        plt.style.use('dark_background')
-        self.figure = plt.figure(figsize=(8, 8))
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setStyleSheet("background-color: #2A2A2A;")
-        graphs_layout.addWidget(self.canvas)
-        graphs_widget.setLayout(graphs_layout)
+        self.graphs_layout = QVBoxLayout()
+        graphs_widget.setLayout(self.graphs_layout)
 
         # Add tabs
-        tab_widget.addTab(input_widget, "Calculator")
-        tab_widget.addTab(graphs_widget, "Graphs")
+        self.tab_widget.addTab(input_widget, "Calculator")
+        self.graphs_index = self.tab_widget.addTab(graphs_widget, "Graphs")
+        # Only redraw the figure once the Graphs tab is actually shown
+        self.tab_widget.currentChanged.connect(self._maybe_replot)
         
-        main_layout.addWidget(tab_widget)
+        main_layout.addWidget(self.tab_widget)
         self.setLayout(main_layout)
 
-    def plot_graphs(self, principal, rate, tenure, emi, total_pay, total_int, lump=0, year_n=0):
-        self.figure.clear()
-        
+    def _build_canvas(self):
+        # Deferred so matplotlib is only imported once the Graphs tab is opened
+        from matplotlib import style
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+        # Configure matplotlib dark theme locally instead of mutating global rcParams
+        with style.context('dark_background'):
+            self.figure = Figure(figsize=(8, 8), constrained_layout=True)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setStyleSheet("background-color: #2A2A2A;")
+        self.graphs_layout.addWidget(self.canvas)
+
+    def _maybe_replot(self, index):
+        if index != self.graphs_index:
+            return
+        if self.figure is None:
+            self._build_canvas()
+        if self._plot_dirty:
+            self._plot_dirty = False
+            self.plot_graphs(*self._pending_plot)
+
+    def _build_axes(self):
         # Set figure background color
         self.figure.patch.set_facecolor('#2A2A2A')
         
         # Create subplot layout
-        gs = self.figure.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
-        
-        # Custom colors for graphs
-        colors = ['#007ACC', '#00CC89', '#CC4400', '#CC008B']
+        gs = self.figure.add_gridspec(2, 2)
         
         # 1. Payment Breakdown Pie Chart
-        ax1 = self.figure.add_subplot(gs[0, 0])
-        ax1.set_facecolor('#2A2A2A')
+        self._ax1 = self.figure.add_subplot(gs[0, 0])
+        self._ax1.set_facecolor('#2A2A2A')
+        self._ax1.set_title('Payment Breakdown', color='white', pad=20)
+
+        # 2. Monthly Payment Schedule
+        self._ax2 = self.figure.add_subplot(gs[0, 1])
+        self._ax2.set_facecolor('#2A2A2A')
+        self._line2, = self._ax2.plot([], [], color=PLOT_COLORS[0], linewidth=2)
+        self._ax2.set_title('Outstanding Principal Over Time', color='white', pad=20)
+        self._ax2.set_xlabel('Months', color='white')
+        self._ax2.set_ylabel('Outstanding Amount (₹)', color='white')
+
+        # 3. EMI Components Over Time
+        self._ax3 = self.figure.add_subplot(gs[1, :])
+        self._ax3.set_facecolor('#2A2A2A')
+        self._ax3.set_title('EMI Components Over Time', color='white', pad=20)
+        self._ax3.set_xlabel('Months', color='white')
+        self._ax3.set_ylabel('Amount (₹)', color='white')
+
+        for ax in (self._ax2, self._ax3):
+            ax.grid(True, linestyle='--', alpha=0.3)
+            ax.tick_params(colors='white')
+            for spine in ax.spines.values():
+                spine.set_color('white')
+
+    def plot_graphs(self, principal, rate, tenure, emi, total_pay, total_int, lump=0, year_n=0):
+        from matplotlib import style
+
+        if self.figure is None:
+            self._build_canvas()
+        # Artists pick up rcParams when created, so build them under the dark style
+        with style.context('dark_background'):
+            self._update_graphs(principal, rate, tenure, emi, total_int)
+        self.canvas.draw_idle()
+
+    def _update_graphs(self, principal, rate, tenure, emi, total_int):
+        # Axes and static styling are built once; later calls only swap the data
+        if self._ax1 is None:
+            self._build_axes()
+
+        # 1. Payment Breakdown Pie Chart
         labels = ['Principal', 'Interest']
         sizes = [principal, total_int]
-        wedges, texts, autotexts = ax1.pie(sizes, labels=labels, autopct='%1.1f%%', 
-                                         startangle=90, colors=colors)
-        ax1.set_title('Payment Breakdown', color='white', pad=20)
+        if self._pie is None:
+            self._pie = self._ax1.pie(sizes, labels=labels, autopct='%1.1f%%', 
+                                      startangle=90, colors=PLOT_COLORS)
+        else:
+            self._update_pie(sizes)
 
         # 2. Monthly Payment Schedule
-        ax2 = self.figure.add_subplot(gs[0, 1])
-        ax2.set_facecolor('#2A2A2A')
-        months = np.arange(1, tenure * 12 + 1)
-        outstanding = []
         monthly_rate = rate / 100 / 12
+        total_months = int(tenure * 12)
+        months = np.arange(1, total_months + 1)
+        outstanding, principal_component, interest_component = _amort_curves(
+            principal, monthly_rate, total_months, emi)
+
+        # Only thin what gets drawn; the numeric results above use every month
+        stride = max(1, -(-total_months // MAX_PLOT_POINTS))
+        idx = np.arange(0, total_months, stride)
+        if idx[-1] != total_months - 1:
+            idx = np.append(idx, total_months - 1)
+        months = months[idx]
+        outstanding = outstanding[idx]
+        principal_component = principal_component[idx]
+        interest_component = interest_component[idx]
         
-        for month in months:
-            out = calculate_outstanding_principal(principal, rate, tenure, month)
-            outstanding.append(out)
-        
-        ax2.plot(months, outstanding, color=colors[0], linewidth=2)
-        ax2.set_title('Outstanding Principal Over Time', color='white', pad=20)
-        ax2.set_xlabel('Months', color='white')
-        ax2.set_ylabel('Outstanding Amount (₹)', color='white')
-        ax2.grid(True, linestyle='--', alpha=0.3)
-        ax2.tick_params(colors='white')
-        for spine in ax2.spines.values():
-            spine.set_color('white')
+        self._line2.set_data(months, outstanding)
+        self._ax2.relim()
+        self._ax2.autoscale_view()
 
         # 3. EMI Components Over Time
-        ax3 = self.figure.add_subplot(gs[1, :])
-        ax3.set_facecolor('#2A2A2A')
-        principal_component = []
-        interest_component = []
-        
-        for month in months:
-            outstanding_amount = calculate_outstanding_principal(principal, rate, tenure, month-1)
-            interest = outstanding_amount * monthly_rate
-            principal_part = emi - interest
-            principal_component.append(principal_part)
-            interest_component.append(interest)
-
-        ax3.stackplot(months, [principal_component, interest_component], 
-                     labels=['Principal', 'Interest'], colors=colors[:2])
-        ax3.set_title('EMI Components Over Time', color='white', pad=20)
-        ax3.set_xlabel('Months', color='white')
-        ax3.set_ylabel('Amount (₹)', color='white')
-        ax3.legend(facecolor='#2A2A2A', edgecolor='white', labelcolor='white')
-        ax3.grid(True, linestyle='--', alpha=0.3)
-        ax3.tick_params(colors='white')
-        for spine in ax3.spines.values():
-            spine.set_color('white')
-
-        # Adjust layout and display
-        self.figure.tight_layout()
-        self.canvas.draw()
+        if not self._stack_collections:
+            self._stack_collections = self._ax3.stackplot(
+                months, [principal_component, interest_component],
+                labels=['Principal', 'Interest'], colors=PLOT_COLORS[:2])
+            self._ax3.legend(facecolor='#2A2A2A', edgecolor='white', labelcolor='white')
+        else:
+            lower = np.zeros_like(principal_component)
+            for poly, layer in zip(self._stack_collections,
+                                   (principal_component, interest_component)):
+                upper = lower + layer
+                verts = np.column_stack([np.concatenate([months, months[::-1]]),
+                                         np.concatenate([lower, upper[::-1]])])
+                poly.set_verts([verts])
+                lower = upper
+            # relim() skips collections, so reset the data limits from the new stack
+            self._ax3.ignore_existing_data_limits = True
+            self._ax3.update_datalim(np.column_stack([months, lower]))
+            self._ax3.update_datalim([(months[0], 0.0)])
+            self._ax3.autoscale_view()
+
+    def _update_pie(self, sizes, labeldistance=1.1, pctdistance=0.6):
+        # Same geometry as Axes.pie(startangle=90), applied to the existing artists
+        wedges, texts, autotexts = self._pie
+        fracs = np.asarray(sizes, dtype=np.float64) / np.sum(sizes)
+        theta1 = 90.0
+        for wedge, text, autotext, frac in zip(wedges, texts, autotexts, fracs):
+            theta2 = theta1 + 360.0 * frac
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            mid = np.deg2rad((theta1 + theta2) / 2)
+            x, y = np.cos(mid), np.sin(mid)
+            text.set_position((labeldistance * x, labeldistance * y))
+            text.set_horizontalalignment('left' if x > 0 else 'right')
+            autotext.set_position((pctdistance * x, pctdistance * y))
+            autotext.set_text(f'{frac:.1%}')
+            theta1 = theta2
 
     def on_calculate(self):
-        try:
-            down = float(self.edit_down.text())
-            loan = float(self.edit_loan.text())
-            rate = float(self.edit_rate.text())
-            tenure = float(self.edit_tenure.text())
-            lump = float(self.edit_lump.text() or 0)
-            year_n = int(self.edit_year.text() or 0)
-        except ValueError:
+        # Parse with the validators' locale so accepted text always converts
+        loc = self.edit_loan.validator().locale()
+        values = []
+        for w in (self.edit_down, self.edit_loan, self.edit_rate, self.edit_tenure):
+            value, ok = loc.toDouble(w.text())
+            if not ok:
+                QMessageBox.warning(self, "Input Error", "Please enter valid numeric values.")
+                return
+            values.append(value)
+        down, loan, rate, tenure = values
+        lump, ok_lump = loc.toDouble(self.edit_lump.text() or '0')
+        year_n, ok_year = loc.toInt(self.edit_year.text() or '0')
+        if not (ok_lump and ok_year):
             QMessageBox.warning(self, "Input Error", "Please enter valid numeric values.")
             return
 
@@ -366,8 +496,10 @@ class EMICalculator(QWidget):
 
         self.lbl_result.setText("<br>".join(text))
         
-        # Update graphs
-        self.plot_graphs(principal, rate, tenure, emi, total_pay, total_int, lump, year_n)
+        # Update graphs (deferred until the Graphs tab is visible)
+        self._pending_plot = (principal, rate, tenure, emi, total_pay, total_int, lump, year_n)
+        self._plot_dirty = True
+        self._maybe_replot(self.tab_widget.currentIndex())
 
 
 if __name__ == "__main__":